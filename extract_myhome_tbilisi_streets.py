@@ -1,15 +1,39 @@
+from operator import itemgetter
 from pathlib import Path
-import json
+import csv
+import os
+
+import orjson
+
+try:
+  import simdjson
+except ImportError:  # pysimdjson is optional; fall back to a full orjson parse
+  simdjson = None
 
 
 MYHOME_PATH = Path("myhome.json")
 OUT_JSON = Path("myhome_tbilisi_streets.json")
 OUT_CSV = Path("myhome_tbilisi_streets.csv")
-
-
-def extract_tbilisi_streets():
-  """Flatten Tbilisi streets from the new myhome.json structure."""
-  data = json.loads(MYHOME_PATH.read_text(encoding="utf-8"))
+# Outputs are streamed into these and only moved into place once every row
+# is written, so a dump that fails partway leaves the previous files intact
+TMP_JSON = OUT_JSON.with_suffix(".json.tmp")
+TMP_CSV = OUT_CSV.with_suffix(".csv.tmp")
+
+
+def load_myhome_json():
+  """
+  Parse myhome.json. With pysimdjson installed the document is parsed with
+  SIMD and objects are only materialized as their fields are accessed.
+  """
+  raw = MYHOME_PATH.read_bytes()
+  if simdjson is not None:
+    return simdjson.Parser().parse(raw)
+  return orjson.loads(raw)
+
+
+def find_tbilisi():
+  """Return the Tbilisi city object from the new myhome.json structure."""
+  data = load_myhome_json()
   cities = data.get("data", {}).get("cities", [])
 
   if not cities:
@@ -19,9 +43,11 @@ def extract_tbilisi_streets():
   tbilisi = next((c for c in cities if c.get("id") == 1 or c.get("display_name") == "თბილისი"), None)
   if not tbilisi:
     raise RuntimeError("Could not find Tbilisi in data.cities (id=1/display_name='თბილისი')")
+  return tbilisi
 
-  streets = []
 
+def iter_tbilisi_streets(tbilisi):
+  """Yield flat Tbilisi street rows one at a time."""
   for district in tbilisi.get("districts", []):
     district_id = district.get("id")
     district_name = district.get("display_name")
@@ -36,69 +62,71 @@ def extract_tbilisi_streets():
       urban_streets = urban.get("streets", []) or []
 
       for st in urban_streets:
-        streets.append(
-          {
-            "city_id": tbilisi.get("id"),
-            "city_name": tbilisi.get("display_name"),
-            "district_id": district_id,
-            "district_name": district_name,
-            "urban_id": urban_id,
-            "urban_name": urban_name,
-            "id": st.get("id"),
-            "display_name": st.get("display_name"),
-            # myhome does not provide a separate English search name here; keep field for symmetry
-            "search_display_name": "",
-            "latitude": st.get("lat"),
-            "longitude": st.get("lng"),
-          }
-        )
-
-  return streets
+        yield {
+          "city_id": tbilisi.get("id"),
+          "city_name": tbilisi.get("display_name"),
+          "district_id": district_id,
+          "district_name": district_name,
+          "urban_id": urban_id,
+          "urban_name": urban_name,
+          "id": st.get("id"),
+          "display_name": st.get("display_name"),
+          # myhome does not provide a separate English search name here; keep field for symmetry
+          "search_display_name": "",
+          "latitude": st.get("lat"),
+          "longitude": st.get("lng"),
+        }
 
 
 def main():
   if not MYHOME_PATH.exists():
     raise SystemExit(f"{MYHOME_PATH} not found")
 
-  streets = extract_tbilisi_streets()
-  print(f"Found {len(streets)} myhome Tbilisi street entries")
-
-  # Save as flat JSON similar to ss_tbilisi_streets.json
-  OUT_JSON.write_text(
-    json.dumps(streets, ensure_ascii=False, indent=2),
-    encoding="utf-8",
-  )
+  # Fail on a dump without Tbilisi before any temp files are created
+  tbilisi = find_tbilisi()
+
+  header = [
+    "city_id",
+    "city_name",
+    "district_id",
+    "district_name",
+    "urban_id",
+    "urban_name",
+    "id",
+    "display_name",
+    "search_display_name",
+    "latitude",
+    "longitude",
+  ]
+  # Every row is built with all header keys, so a C-level getter is safe
+  get_cols = itemgetter(*header)
+  count = 0
+
+  # Stream each street straight into both outputs instead of building a list:
+  #  - flat, compact JSON similar to ss_tbilisi_streets.json, written one
+  #    array element at a time (same bytes as dumping the whole list)
+  #  - CSV with key columns, similar to ss_tbilisi_streets.csv
+  with TMP_JSON.open("wb", buffering=1 << 20) as json_f, TMP_CSV.open(
+    "w", encoding="utf-8", newline="", buffering=1 << 20
+  ) as csv_f:
+    writer = csv.writer(csv_f, lineterminator="\n")
+    writer.writerow(header)
+    json_f.write(b"[")
+
+    for row in iter_tbilisi_streets(tbilisi):
+      if count:
+        json_f.write(b",")
+      json_f.write(orjson.dumps(row))
+      writer.writerow(get_cols(row))
+      count += 1
+
+    json_f.write(b"]")
+
+  os.replace(TMP_JSON, OUT_JSON)
+  os.replace(TMP_CSV, OUT_CSV)
+
+  print(f"Found {count} myhome Tbilisi street entries")
   print(f"Saved JSON to {OUT_JSON}")
-
-  # Save as CSV with key columns, similar to ss_tbilisi_streets.csv
-  with OUT_CSV.open("w", encoding="utf-8", newline="") as f:
-    header = [
-      "city_id",
-      "city_name",
-      "district_id",
-      "district_name",
-      "urban_id",
-      "urban_name",
-      "id",
-      "display_name",
-      "search_display_name",
-      "latitude",
-      "longitude",
-    ]
-    f.write(",".join(header) + "\n")
-
-    def esc(value):
-      if value is None:
-        return ""
-      text = str(value)
-      text = text.replace('"', '""')
-      if "," in text or '"' in text:
-        return f'"{text}"'
-      return text
-
-    for row in streets:
-      f.write(",".join(esc(row.get(col)) for col in header) + "\n")
-
   print(f"Saved CSV to {OUT_CSV}")
 
 
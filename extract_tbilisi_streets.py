@@ -1,19 +1,24 @@
+from operator import itemgetter
 from pathlib import Path
-import json
+import csv
 
-from bs4 import BeautifulSoup
+import orjson
+from lxml import html as lhtml
 
 
 def load_next_data(html_path: Path) -> dict:
   """Extract and parse the __NEXT_DATA__ JSON from an ss.ge page dump."""
-  html = html_path.read_text(encoding="utf-8")
-  soup = BeautifulSoup(html, "html.parser")
+  # Pass raw bytes so lxml decodes them itself instead of re-encoding a str
+  parser = lhtml.HTMLParser(encoding="utf-8")
+  tree = lhtml.fromstring(html_path.read_bytes(), parser=parser)
 
-  script = soup.find("script", id="__NEXT_DATA__", type="application/json")
-  if not script or not script.string:
+  script_text = tree.xpath(
+    'string(//script[@id="__NEXT_DATA__"][@type="application/json"])'
+  )
+  if not script_text:
     raise RuntimeError("Could not find __NEXT_DATA__ script with JSON content")
 
-  data = json.loads(script.string)
+  data = orjson.loads(str(script_text))
   return data
 
 
@@ -75,15 +80,14 @@ def main():
 
   print(f"Extracted {len(streets)} Tbilisi street entries")
 
-  # Save flat JSON for further processing / matching
+  # Save flat, compact JSON for further processing / matching
   out_json = Path("ss_tbilisi_streets.json")
-  out_json.write_text(json.dumps(streets, ensure_ascii=False, indent=2), encoding="utf-8")
+  out_json.write_bytes(orjson.dumps(streets))
   print(f"Saved flat street list to {out_json}")
 
   # Also save a CSV with key columns
   out_csv = Path("ss_tbilisi_streets.csv")
-  with out_csv.open("w", encoding="utf-8", newline="") as f:
-    # Simple manual CSV (no extra dependency)
+  with out_csv.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
     header = [
       "cityId",
       "cityTitle",
@@ -96,21 +100,11 @@ def main():
       "latitude",
       "longitude",
     ]
-    f.write(",".join(header) + "\n")
-
-    def esc(value):
-      if value is None:
-        return ""
-      text = str(value)
-      # Escape double quotes for CSV
-      text = text.replace('"', '""')
-      # Wrap in quotes if it contains comma or quote
-      if "," in text or '"' in text:
-        return f'"{text}"'
-      return text
-
-    for row in streets:
-      f.write(",".join(esc(row.get(col)) for col in header) + "\n")
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(header)
+    # Every row is built with all header keys, so a C-level getter is safe
+    get_cols = itemgetter(*header)
+    writer.writerows(map(get_cols, streets))
 
   print(f"Saved CSV street list to {out_csv}")
 
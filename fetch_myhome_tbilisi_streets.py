@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import csv
 import itertools
-import json
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 
-from urllib import request, parse
+import orjson
+import requests
 
 
 OUT_JSON = Path("myhome_tbilisi_streets.json")
 OUT_CSV = Path("myhome_tbilisi_streets.csv")
+# Outputs are streamed into these and only moved into place once the crawl
+# finishes, so an interrupted run leaves the previous files intact
+TMP_JSON = OUT_JSON.with_suffix(".json.tmp")
+TMP_CSV = OUT_CSV.with_suffix(".csv.tmp")
 
 # Georgian alphabet letters used for 2-letter prefixes
 GE_LETTERS = [
@@ -51,115 +62,246 @@ GE_LETTERS = [
 
 BASE_URL = "https://api-locations.tnet.ge/v2/streets"
 
+# Number of requests kept in flight at once; no more than this are ever
+# queued, so an interrupted run stops sending requests straight away
+MAX_WORKERS = 8
+# Minimum delay between two request starts, shared by all workers. Same
+# pacing as the old serial loop (0.2s sleep after each request), so the API
+# never sees a higher request rate; workers only overlap the response times.
+MIN_REQUEST_INTERVAL_S = 0.2
+
+# Most results the API returns for one query. A full page may be truncated,
+# so such prefixes are searched again with one more letter. The API does not
+# document its page size, so by default it is measured from the 2-letter
+# level (see detect_page_cap). Set a number here to skip the measurement.
+PAGE_CAP: Optional[int] = None
+# How many seed pages must share the largest size before it counts as a cap
+MIN_CAPPED_PAGES = 3
+# Longest prefix to refine to
+MAX_PREFIX_LEN = 4
+# Hard limit on API calls per run: the 33*33 seed prefixes plus at most as
+# many refinements. Full pages that no longer fit are reported, not fetched.
+MAX_REQUESTS = 2 * len(GE_LETTERS) ** 2
+
+
+@dataclass(slots=True)
+class StreetRow:
+  """The fields of an API street object that end up in the outputs."""
+
+  city_id: Optional[int]
+  city_name: Optional[str]
+  district_id: Optional[int]
+  district_name: Optional[str]
+  urban_id: Optional[int]
+  urban_name: Optional[str]
+  id: int
+  display_name: Optional[str]
+  search_display_name: Optional[str]
+  latitude: Optional[float]
+  longitude: Optional[float]
+
+  @classmethod
+  def from_api(cls, st: Dict[str, Any]) -> StreetRow:
+    return cls(
+      city_id=st.get("city_id"),
+      city_name=st.get("city_name"),
+      district_id=st.get("district_id"),
+      district_name=st.get("district_name"),
+      urban_id=st.get("urban_id"),
+      urban_name=st.get("urban_name"),
+      id=st["id"],
+      display_name=st.get("display_name"),
+      search_display_name=st.get("search_display_name"),
+      latitude=st.get("latitude"),
+      longitude=st.get("longitude"),
+    )
 
-def fetch_prefix(prefix: str) -> list[Dict[str, Any]]:
-  """
-  Call the myhome streets search API with a given prefix and return the data list.
-  The API requires q to be at least 2 characters, so we use 2-letter prefixes.
-  """
-  # Percent-encode the Georgian prefix
-  q_encoded = parse.quote(prefix)
-  url = f"{BASE_URL}?q={q_encoded}&city_id=1"
 
-  req = request.Request(
-    url,
-    headers={
+class RateLimiter:
+  """Space out calls across threads so that at most one starts per interval."""
+
+  def __init__(self, interval_s: float):
+    self.interval_s = interval_s
+    self._lock = threading.Lock()
+    self._next_start = 0.0
+
+  def wait(self) -> None:
+    with self._lock:
+      now = time.monotonic()
+      start = max(now, self._next_start)
+      self._next_start = start + self.interval_s
+    time.sleep(start - now)
+
+
+def make_session() -> requests.Session:
+  """HTTP session reused by all workers so connections are kept alive."""
+  session = requests.Session()
+  session.headers.update(
+    {
       "User-Agent": "Mozilla/5.0 (compatible; streets-fetcher/1.0)",
       "Accept": "application/json",
-    },
+    }
   )
-  with request.urlopen(req, timeout=10) as resp:
-    body = resp.read().decode("utf-8")
-  data = json.loads(body)
+  return session
+
+
+def fetch_prefix(
+  session: requests.Session, prefix: str, limiter: RateLimiter | None = None
+) -> list[Dict[str, Any]]:
+  """
+  Call the myhome streets search API with a given prefix and return the data list.
+  The API requires q to be at least 2 characters, so we start from 2-letter prefixes.
+  """
+  if limiter is not None:
+    limiter.wait()
+  # requests percent-encodes the Georgian prefix
+  resp = session.get(BASE_URL, params={"q": prefix, "city_id": 1}, timeout=10)
+  resp.raise_for_status()
+  data = orjson.loads(resp.content)
   return data.get("data") or []
 
 
+def fetch_in_order(
+  ex: ThreadPoolExecutor,
+  session: requests.Session,
+  prefixes: list[str],
+  limiter: RateLimiter,
+) -> Iterator[tuple[str, Future]]:
+  """
+  Yield (prefix, future) pairs in prefix order, submitting the next prefix
+  only as an earlier one is taken, so that at most MAX_WORKERS requests are
+  queued behind the one being consumed.
+  """
+  pending = iter(prefixes)
+  window: deque[tuple[str, Future]] = deque()
+  for prefix in itertools.islice(pending, MAX_WORKERS):
+    window.append((prefix, ex.submit(fetch_prefix, session, prefix, limiter)))
+  while window:
+    taken = window.popleft()
+    prefix = next(pending, None)
+    if prefix is not None:
+      window.append((prefix, ex.submit(fetch_prefix, session, prefix, limiter)))
+    yield taken
+
+
+def detect_page_cap(page_sizes: list[int]) -> Optional[int]:
+  """
+  Guess the API's page size from the result counts of the 2-letter level.
+  A real cap shows up as many pages of exactly the same, largest size. If
+  fewer than MIN_CAPPED_PAGES pages share it, no page looks truncated and
+  None is returned, so nothing is refined.
+  """
+  if not page_sizes:
+    return None
+  largest = max(page_sizes)
+  if largest < 2 or page_sizes.count(largest) < MIN_CAPPED_PAGES:
+    return None
+  return largest
+
+
 def main():
-  seen: Dict[int, Dict[str, Any]] = {}
+  seen: set[int] = set()
 
-  total_prefixes = len(GE_LETTERS) ** 2
-  prefix_idx = 0
+  # Breadth-first over the prefix tree: query every 2-letter prefix, then
+  # only descend into prefixes whose result page came back full.
+  level = [a + b for a, b in itertools.product(GE_LETTERS, repeat=2)]
+  page_cap = PAGE_CAP
+  requests_sent = 0
+  unrefined_full_pages = 0
 
-  for a, b in itertools.product(GE_LETTERS, repeat=2):
-    prefix_idx += 1
-    prefix = a + b
-    # Avoid printing non-ASCII characters to consoles that don't support them
-    print(f"[{prefix_idx}/{total_prefixes}] Fetching prefix")
+  session = make_session()
+  # Be nice to the API
+  limiter = RateLimiter(MIN_REQUEST_INTERVAL_S)
 
-    try:
-      items = fetch_prefix(prefix)
-    except Exception as e:
-      print(f"  Error for prefix {prefix}: {e}")
-      # Be resilient: skip this prefix and continue
-      time.sleep(0.2)
-      continue
+  header = [field.name for field in fields(StreetRow)]
+  get_cols = attrgetter(*header)
 
-    print(f"  Received {len(items)} items")
+  # Each new street is written to both outputs as soon as it is seen, so only
+  # the ids are kept in memory:
+  #  - compact JSON (the CSV is the human-readable copy), one array element
+  #    at a time
+  #  - CSV similar to previous myhome_tbilisi_streets.csv
+  with TMP_JSON.open("wb", buffering=1 << 20) as json_f, TMP_CSV.open(
+    "w", encoding="utf-8", newline="", buffering=1 << 20
+  ) as csv_f:
+    writer = csv.writer(csv_f, lineterminator="\n")
+    writer.writerow(header)
+    json_f.write(b"[")
 
-    for st in items:
-      # Filter to Tbilisi streets only, in case city_id filter is not strictly enforced
-      if st.get("city_id") != 1 and st.get("city_name") != "თბილისი":
-        continue
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+      while level:
+        requests_sent += len(level)
+        page_sizes: list[tuple[str, int]] = []
 
-      sid = st.get("id")
-      if sid is None:
-        continue
+        # Consume results in prefix order so the output order stays stable
+        for prefix_idx, (prefix, future) in enumerate(
+          fetch_in_order(ex, session, level, limiter), start=1
+        ):
+          # Avoid printing non-ASCII characters to consoles that don't support them
+          print(f"[{prefix_idx}/{len(level)}] Fetching {len(prefix)}-letter prefix")
 
-      if sid not in seen:
-        seen[sid] = st
+          try:
+            items = future.result()
+          except Exception as e:
+            print(f"  Error for prefix {prefix}: {e}")
+            # Be resilient: skip this prefix and continue
+            continue
 
-    # Be nice to the API
-    time.sleep(0.2)
+          print(f"  Received {len(items)} items")
+          if not items:
+            continue
+          page_sizes.append((prefix, len(items)))
 
-  streets = list(seen.values())
-  print(f"Total unique Tbilisi streets collected from API: {len(streets)}")
+          for st in items:
+            # Filter to Tbilisi streets only, in case city_id filter is not strictly enforced
+            if st.get("city_id") != 1 and st.get("city_name") != "თბილისი":
+              continue
 
-  # Save JSON
-  OUT_JSON.write_text(json.dumps(streets, ensure_ascii=False, indent=2), encoding="utf-8")
-  print(f"Saved JSON to {OUT_JSON}")
+            sid = st.get("id")
+            if sid is None or sid in seen:
+              continue
+
+            # Keep only the output fields instead of the whole API object
+            row = StreetRow.from_api(st)
+            if seen:
+              json_f.write(b",")
+            json_f.write(orjson.dumps(row))
+            writer.writerow(get_cols(row))
+            seen.add(sid)
+
+        if page_cap is None:
+          page_cap = detect_page_cap([n for _, n in page_sizes])
+          if page_cap is None:
+            break
 
-  # Save CSV similar to previous myhome_tbilisi_streets.csv
-  with OUT_CSV.open("w", encoding="utf-8", newline="") as f:
-    header = [
-      "city_id",
-      "city_name",
-      "district_id",
-      "district_name",
-      "urban_id",
-      "urban_name",
-      "id",
-      "display_name",
-      "search_display_name",
-      "latitude",
-      "longitude",
-    ]
-    f.write(",".join(header) + "\n")
-
-    def esc(value: Any) -> str:
-      if value is None:
-        return ""
-      text = str(value)
-      text = text.replace('"', '""')
-      if "," in text or '"' in text:
-        return f'"{text}"'
-      return text
-
-    for st in streets:
-      row = {
-        "city_id": st.get("city_id"),
-        "city_name": st.get("city_name"),
-        "district_id": st.get("district_id"),
-        "district_name": st.get("district_name"),
-        "urban_id": st.get("urban_id"),
-        "urban_name": st.get("urban_name"),
-        "id": st.get("id"),
-        "display_name": st.get("display_name"),
-        "search_display_name": st.get("search_display_name"),
-        "latitude": st.get("latitude"),
-        "longitude": st.get("longitude"),
-      }
-      f.write(",".join(esc(row[col]) for col in header) + "\n")
+        level = []
+        for prefix, n in page_sizes:
+          if n < page_cap:
+            continue
+          if (
+            len(prefix) >= MAX_PREFIX_LEN
+            or requests_sent + len(level) + len(GE_LETTERS) > MAX_REQUESTS
+          ):
+            # ascii() keeps the Georgian prefix printable on any console
+            print(f"Full page for {ascii(prefix)} not refined; results may be truncated")
+            unrefined_full_pages += 1
+            continue
+          level.extend(prefix + c for c in GE_LETTERS)
 
+    json_f.write(b"]")
+
+  os.replace(TMP_JSON, OUT_JSON)
+  os.replace(TMP_CSV, OUT_CSV)
+
+  print(f"Total unique Tbilisi streets collected from API: {len(seen)}")
+  print(f"API requests sent: {requests_sent} (limit {MAX_REQUESTS})")
+  print(f"Page size used for refinement: {page_cap if page_cap is not None else 'none detected'}")
+  if unrefined_full_pages:
+    print(
+      f"Warning: {unrefined_full_pages} full pages could not be refined further; "
+      "some streets may be missing"
+    )
+  print(f"Saved JSON to {OUT_JSON}")
   print(f"Saved CSV to {OUT_CSV}")
 
 
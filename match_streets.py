@@ -2,15 +2,51 @@ from __future__ import annotations
 
 from collections import defaultdict
 from pathlib import Path
-import json
+import functools
 import re
 
+import orjson
+
+try:
+  import simdjson
+except ImportError:  # pysimdjson is optional; fall back to a full orjson parse
+  simdjson = None
+
 
 MYHOME_PATH = Path("myhome.json")
 SS_PATH = Path("ss_tbilisi_streets.json")
 OUT_PATH = Path("street_mapping_myhome_to_ss.json")
 
-
+# Common trailing type tokens to strip (with or without dot)
+_TYPE_SUFFIXES = [
+  r"\bქუჩა",
+  r"\bქ\.?",        # ქ / ქ.
+  r"\bგამზ\.?",     # გამზ / გამზ.
+  r"\bჩიხი",
+  r"\bჩ\.",         # ჩ.
+  r"\bკვარტალი",
+  r"\bკვ\.?",       # კვ / კვ.
+  r"\bპლატო",
+  r"\bმიკრორაიონი",
+  r"\bმ\/რ\.?",     # მ/რ / მ/რ.
+  r"\bმოედანი",
+]
+
+# Patterns used by normalize_georgian_street, compiled once
+_RE_TRAIL_PUNCT = re.compile(r"[,\.\s]+$", re.IGNORECASE)
+_RE_SHES = re.compile(r"\bშეს\.\b", re.IGNORECASE)
+_RE_ROMAN = re.compile(
+  r"\s+[ivx]+\s+(?=(ქ\.?|ქუჩა|ჩიხი|შესახვევი|შეს\.?|კვ\.?|კვარტალი)\b)",
+  re.IGNORECASE,
+)
+_RE_SUFFIX = re.compile(
+  r"(?:\s+(?:{}))+$".format("|".join(_TYPE_SUFFIXES)), re.IGNORECASE
+)
+_RE_DASH = re.compile(r"[-–—]+")
+_RE_SPACES = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=None)
 def normalize_georgian_street(name: str) -> str:
   """
   Build a canonical key for Georgian street / microdistrict names so that
@@ -26,10 +62,10 @@ def normalize_georgian_street(name: str) -> str:
   s = name.strip()
 
   # Remove trailing commas and periods
-  s = re.sub(r"[,\.\s]+$", "", s, flags=re.IGNORECASE)
+  s = _RE_TRAIL_PUNCT.sub("", s)
 
   # Normalize short "შეს." -> full "შესახვევი" to reduce variants
-  s = re.sub(r"\bშეს\.\b", " შესახვევი ", s, flags=re.IGNORECASE)
+  s = _RE_SHES.sub(" შესახვევი ", s)
 
   # Strip Roman numerals used for branch numbering (I, II, III, IV, ...)
   # when they appear right before a type word like ქ./ქუჩა/ჩიხი/შესახვევი/კვ.
@@ -37,63 +73,66 @@ def normalize_georgian_street(name: str) -> str:
   #   "ასპინძის I ქ."        -> "ასპინძის ქ."
   #   "ასკანის II ჩიხი"      -> "ასკანის ჩიხი"
   #   "13 ასურელი მამის I შეს." -> "13 ასურელი მამის შეს."
-  s = re.sub(
-    r"\s+[ivx]+\s+(?=(ქ\.?|ქუჩა|ჩიხი|შესახვევი|შეს\.?|კვ\.?|კვარტალი)\b)",
-    " ",
-    s,
-    flags=re.IGNORECASE,
-  )
+  s = _RE_ROMAN.sub(" ", s)
 
-  # Common trailing type tokens to strip (with or without dot)
-  type_suffixes = [
-    r"\bქუჩა",
-    r"\bქ\.?",        # ქ / ქ.
-    r"\bგამზ\.?",     # გამზ / გამზ.
-    r"\bჩიხი",
-    r"\bჩ\.",         # ჩ.
-    r"\bკვარტალი",
-    r"\bკვ\.?",       # კვ / კვ.
-    r"\bპლატო",
-    r"\bმიკრორაიონი",
-    r"\bმ\/რ\.?",     # მ/რ / მ/რ.
-    r"\bმოედანი",
-  ]
-  pattern = r"(?:\s+(?:{}))+$".format("|".join(type_suffixes))
-  s = re.sub(pattern, "", s, flags=re.IGNORECASE)
+  # Strip trailing type tokens (see _TYPE_SUFFIXES)
+  s = _RE_SUFFIX.sub("", s)
 
   # Normalize hyphens / dashes to a single space
-  s = re.sub(r"[-–—]+", " ", s)
+  s = _RE_DASH.sub(" ", s)
 
   # Collapse multiple spaces
-  s = re.sub(r"\s+", " ", s)
+  s = _RE_SPACES.sub(" ", s)
 
   return s.strip().lower()
 
 
+def load_myhome_json():
+  """
+  Parse myhome.json. With pysimdjson installed the document is parsed with
+  SIMD and objects are only materialized as their fields are accessed.
+  """
+  raw = MYHOME_PATH.read_bytes()
+  if simdjson is not None:
+    return simdjson.Parser().parse(raw)
+  return orjson.loads(raw)
+
+
 def load_myhome():
-  data = json.loads(MYHOME_PATH.read_text(encoding="utf-8"))
+  data = load_myhome_json()
   rows = data.get("data", [])
   # Only Tbilisi (city_id == 1)
   return [row for row in rows if row.get("city_id") == 1]
 
 
 def load_ss():
-  rows = json.loads(SS_PATH.read_text(encoding="utf-8"))
+  rows = orjson.loads(SS_PATH.read_bytes())
   # ss_tbilisi_streets.json is already Tbilisi-only
   return rows
 
 
 def build_ss_index(ss_rows):
   """
-  Build index: canonical_name -> list of ss street rows.
+  Build index: canonical_name -> tuple of mapping fields, one per ss street.
+
+  The ss half of each mapping is built once here instead of once per
+  matching myhome row.
   """
   index = defaultdict(list)
   for row in ss_rows:
     title = row.get("streetTitle") or ""
     canon = normalize_georgian_street(title)
     if canon:
-      index[canon].append(row)
-  return index
+      index[canon].append(
+        {
+          "ss_streetId": row.get("streetId"),
+          "ss_streetTitle": row.get("streetTitle"),
+          "ss_canonical": canon,
+          "ss_districtTitle": row.get("districtTitle"),
+          "ss_subDistrictTitle": row.get("subDistrictTitle"),
+        }
+      )
+  return {canon: tuple(entries) for canon, entries in index.items()}
 
 
 def match_myhome_to_ss():
@@ -109,7 +148,7 @@ def match_myhome_to_ss():
     display_name = row.get("display_name") or ""
     canon = normalize_georgian_street(display_name)
 
-    candidates = ss_index.get(canon, [])
+    candidates = ss_index.get(canon, ())
 
     if not candidates:
       unmatched.append(
@@ -121,21 +160,19 @@ def match_myhome_to_ss():
       )
       continue
 
+    mh_fields = {
+      "myhome_id": mh_id,
+      "myhome_display_name": display_name,
+      "myhome_canonical": canon,
+    }
+
     # If multiple streets share the same canonical form, keep them all;
     # the consumer can later disambiguate using district info or handle 1:N.
-    for cand in candidates:
-      mappings.append(
-        {
-          "myhome_id": mh_id,
-          "myhome_display_name": display_name,
-          "myhome_canonical": canon,
-          "ss_streetId": cand.get("streetId"),
-          "ss_streetTitle": cand.get("streetTitle"),
-          "ss_canonical": canon,
-          "ss_districtTitle": cand.get("districtTitle"),
-          "ss_subDistrictTitle": cand.get("subDistrictTitle"),
-        }
-      )
+    if len(candidates) == 1:
+      mh_fields.update(candidates[0])
+      mappings.append(mh_fields)
+    else:
+      mappings.extend({**mh_fields, **cand} for cand in candidates)
 
   return mappings, unmatched
 
@@ -148,16 +185,14 @@ def main():
 
   mappings, unmatched = match_myhome_to_ss()
 
-  OUT_PATH.write_text(
-    json.dumps(
+  OUT_PATH.write_bytes(
+    orjson.dumps(
       {
         "mappings": mappings,
         "unmatched": unmatched,
       },
-      ensure_ascii=False,
-      indent=2,
-    ),
-    encoding="utf-8",
+      option=orjson.OPT_INDENT_2,
+    )
   )
 
   print(f"Total myhome Tbilisi entries: {len(mappings) + len(unmatched)}")
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
 import csv
-import json
 import math
-from dataclasses import dataclass
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Iterator, List, Dict, Any, Tuple
+
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+try:
+  from scipy.sparse import coo_matrix
+  from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+except ImportError:  # SciPy is optional; one-to-one matching falls back to greedy
+  coo_matrix = None
+  min_weight_full_bipartite_matching = None
+
+try:
+  from sklearn.neighbors import BallTree
+except ImportError:  # scikit-learn is optional; candidates then come from the grid
+  BallTree = None
 
 
 MYHOME_CSV = Path("myhome_tbilisi_streets.csv")
@@ -14,154 +31,417 @@ OUT_JSON = Path("street_mapping_by_coords.json")
 OUT_CSV = Path("street_mapping_by_coords.csv")
 
 
-@dataclass
-class Street:
-  source: str  # 'myhome' or 'ss'
-  city_id: Optional[int]
-  city_name: str
-  district_id: Optional[int]
-  district_name: str
-  urban_id: Optional[int]
-  urban_name: str
-  street_id: int
-  street_title: str
-  latitude: Optional[float]
-  longitude: Optional[float]
-
-
-def parse_float(value: str) -> Optional[float]:
-  value = value.strip()
-  if not value:
-    return None
-  try:
-    return float(value)
-  except ValueError:
-    return None
-
-
-def load_myhome_streets() -> List[Street]:
-  streets: List[Street] = []
-  with MYHOME_CSV.open("r", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-      lat = parse_float(row.get("latitude", ""))
-      lng = parse_float(row.get("longitude", ""))
-      if lat is None or lng is None:
-        continue
-      streets.append(
-        Street(
-          source="myhome",
-          city_id=int(row["city_id"]) if row.get("city_id") else None,
-          city_name=row.get("city_name", ""),
-          district_id=int(row["district_id"]) if row.get("district_id") else None,
-          district_name=row.get("district_name", ""),
-          urban_id=int(row["urban_id"]) if row.get("urban_id") else None,
-          urban_name=row.get("urban_name", ""),
-          street_id=int(row["id"]),
-          street_title=row.get("display_name", ""),
-          latitude=lat,
-          longitude=lng,
-        )
-      )
+# Columnar street table: column name -> array with one entry per street.
+#   city_id (int64, -1 if missing), has_city (bool), district_name,
+#   urban_name, street_id (int64), street_title, latitude, longitude (float64)
+Streets = Dict[str, np.ndarray]
+
+# Streets column -> source CSV column
+MYHOME_COLUMNS = {
+  "city_id": "city_id",
+  "district_name": "district_name",
+  "urban_name": "urban_name",
+  "street_id": "id",
+  "street_title": "display_name",
+  "latitude": "latitude",
+  "longitude": "longitude",
+}
+SS_COLUMNS = {
+  "city_id": "cityId",
+  "district_name": "districtTitle",
+  "urban_name": "subDistrictTitle",
+  "street_id": "streetId",
+  "street_title": "streetTitle",
+  "latitude": "latitude",
+  "longitude": "longitude",
+}
+
+
+# A plain decimal / scientific number, as written by the extractors
+_FLOAT_RE = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+def parse_float_column(values: pa.ChunkedArray) -> pa.ChunkedArray:
+  """
+  Parse a string column to float64; empty or malformed values become null.
+  """
+  values = pc.utf8_trim_whitespace(values)
+  valid = pc.match_substring_regex(values, _FLOAT_RE)
+  return pc.cast(pc.if_else(valid, values, None), pa.float64())
+
+
+def load_streets(path: Path, columns: Dict[str, str]) -> Streets:
+  """
+  Load a street CSV into parallel column arrays, renamed as in `columns`.
+  Streets without an id or coordinates, or with coordinates outside the
+  valid latitude / longitude range (e.g. a lost decimal point), are dropped.
+  """
+  # Pin every column: inferred types turn all-empty or all-digit text columns
+  # into null / int64. Coordinates are parsed below so bad values only drop
+  # their row.
+  column_types = {
+    columns["city_id"]: pa.int64(),
+    columns["district_name"]: pa.string(),
+    columns["urban_name"]: pa.string(),
+    columns["street_id"]: pa.int64(),
+    columns["street_title"]: pa.string(),
+    columns["latitude"]: pa.string(),
+    columns["longitude"]: pa.string(),
+  }
+  table = pacsv.read_csv(
+    path,
+    convert_options=pacsv.ConvertOptions(
+      column_types=column_types, include_columns=list(columns.values())
+    ),
+  )
+  table = table.select(list(columns.values())).rename_columns(list(columns))
+  for name in ("latitude", "longitude"):
+    table = table.set_column(
+      table.schema.get_field_index(name), name, parse_float_column(table[name])
+    )
+  # Null compares as null, which filter() drops along with out-of-range rows.
+  # A null street_id would also turn the whole id column into float64 NaN.
+  table = table.filter(
+    pc.and_(
+      pc.is_valid(table["street_id"]),
+      pc.and_(
+        pc.less_equal(pc.abs(table["latitude"]), 90.0),
+        pc.less_equal(pc.abs(table["longitude"]), 180.0),
+      ),
+    )
+  )
+
+  streets: Streets = {
+    name: table[name].to_numpy(zero_copy_only=False) for name in columns if name != "city_id"
+  }
+  streets["city_id"] = pc.fill_null(table["city_id"], -1).to_numpy(zero_copy_only=False)
+  streets["has_city"] = pc.is_valid(table["city_id"]).to_numpy(zero_copy_only=False)
   return streets
 
 
-def load_ss_streets() -> List[Street]:
-  streets: List[Street] = []
-  with SS_CSV.open("r", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-      lat = parse_float(row.get("latitude", ""))
-      lng = parse_float(row.get("longitude", ""))
-      if lat is None or lng is None:
-        continue
-      streets.append(
-        Street(
-          source="ss",
-          city_id=int(row["cityId"]) if row.get("cityId") else None,
-          city_name=row.get("cityTitle", ""),
-          district_id=int(row["districtId"]) if row.get("districtId") else None,
-          district_name=row.get("districtTitle", ""),
-          urban_id=int(row["subDistrictId"]) if row.get("subDistrictId") else None,
-          urban_name=row.get("subDistrictTitle", ""),
-          street_id=int(row["streetId"]),
-          street_title=row.get("streetTitle", ""),
-          latitude=lat,
-          longitude=lng,
-        )
+def load_myhome_streets() -> Streets:
+  return load_streets(MYHOME_CSV, MYHOME_COLUMNS)
+
+
+def load_ss_streets() -> Streets:
+  return load_streets(SS_CSV, SS_COLUMNS)
+
+
+EARTH_RADIUS_M = 6371000.0
+
+# Size of a spatial grid cell in degrees (~111m of latitude)
+GRID_CELL_DEG = 0.001
+
+# Slack on the flat-earth prefilter so no street within max_distance_m is lost
+APPROX_MARGIN = 1.01
+
+# Fixed-point coordinate scale for the integer bounding-box prefilter
+MICRODEGREES = 1_000_000
+
+
+def haversine_distance_m(
+  phi1: np.ndarray, lam1: np.ndarray, phi2: np.ndarray, lam2: np.ndarray
+) -> np.ndarray:
+  """
+  Great-circle distance between points on Earth (in meters).
+  Inputs are in radians and may be scalars or broadcastable arrays.
+  """
+  dphi = phi2 - phi1
+  dlam = lam2 - lam1
+  a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+  return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def equirectangular_distance_m(
+  phi1: np.ndarray, lam1: np.ndarray, phi2: np.ndarray, lam2: np.ndarray
+) -> np.ndarray:
+  """
+  Flat-earth approximation of haversine_distance_m around the first point.
+  Well within 1% for the sub-km distances matched here; inputs are in radians.
+  """
+  x = (lam2 - lam1) * np.cos(phi1)
+  y = phi2 - phi1
+  return EARTH_RADIUS_M * np.hypot(x, y)
+
+
+def to_microdegrees(deg: np.ndarray) -> np.ndarray:
+  """
+  Degrees as int32 microdegrees. Anything outside +-180 (or NaN) would not
+  survive the cast, so it is rejected instead of quietly wrapped.
+  """
+  if not np.all(np.abs(deg) <= 180.0):
+    raise ValueError("coordinates must be within +-180 degrees to quantize")
+  return np.round(deg * MICRODEGREES).astype(np.int32)
+
+
+def grid_cell(lat: float, lon: float) -> Tuple[int, int]:
+  return (math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG))
+
+
+def build_grid(streets: Streets) -> Dict[Tuple[int, int], List[int]]:
+  """
+  Bucket streets into GRID_CELL_DEG cells: cell -> list of street indices.
+  """
+  grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+  cells_lat = np.floor(streets["latitude"] / GRID_CELL_DEG).astype(np.int64)
+  cells_lon = np.floor(streets["longitude"] / GRID_CELL_DEG).astype(np.int64)
+  for i, cell in enumerate(zip(cells_lat.tolist(), cells_lon.tolist())):
+    grid[cell].append(i)
+  return grid
+
+
+def grid_neighbours(
+  mh_streets: Streets, ss_streets: Streets, max_distance_m: float
+) -> Iterator[List[int]]:
+  """
+  For each myhome street, yield the ss indices in the grid cells that can
+  contain streets within max_distance_m of it.
+  """
+  grid = build_grid(ss_streets)
+  # Streets per row of cells, for points whose search area spans every longitude
+  grid_rows: Dict[int, List[int]] = defaultdict(list)
+  for (row, _), indices in grid.items():
+    grid_rows[row].extend(indices)
+
+  cell_m = math.radians(GRID_CELL_DEG) * EARTH_RADIUS_M
+  reach_deg = math.degrees(max_distance_m / EARTH_RADIUS_M)
+  reach_lat = math.ceil(max_distance_m / cell_m)
+  half_circle = math.ceil(180.0 / GRID_CELL_DEG)
+
+  for mh_lat, mh_lon in zip(mh_streets["latitude"].tolist(), mh_streets["longitude"].tolist()):
+    cell_lat, cell_lon = grid_cell(mh_lat, mh_lon)
+    rows = range(cell_lat - reach_lat, cell_lat + reach_lat + 1)
+
+    # A degree of longitude shrinks with latitude, so it may take more cells to
+    # cover the same distance east-west than north-south. The search area is
+    # widest at its edge nearest to a pole; if it reaches the pole, any
+    # longitude may be in range.
+    edge_lat = abs(mh_lat) + reach_deg
+    reach_lon = half_circle
+    if edge_lat < 90.0:
+      reach_lon = min(
+        math.ceil(max_distance_m / (cell_m * math.cos(math.radians(edge_lat)))), half_circle
       )
-  return streets
+    if reach_lon >= half_circle:
+      yield [ss_idx for row in rows for ss_idx in grid_rows.get(row, ())]
+      continue
+
+    yield [
+      ss_idx
+      for row in rows
+      for dlon in range(-reach_lon, reach_lon + 1)
+      for ss_idx in grid.get((row, cell_lon + dlon), ())
+    ]
 
 
-def haversine_distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+def candidate_pairs(
+  mh_streets: Streets,
+  ss_streets: Streets,
+  max_distance_m: float,
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
   """
-  Great-circle distance between two points on Earth (in meters).
+  Yield (myhome index, ss indices, haversine distances) for every myhome
+  street with at least one compatible ss street that may be within
+  max_distance_m. Distances are not thresholded yet; ss indices are sorted.
   """
-  # Earth radius in meters
-  R = 6371000.0
-  phi1 = math.radians(lat1)
-  phi2 = math.radians(lat2)
-  dphi = math.radians(lat2 - lat1)
-  dlambda = math.radians(lon2 - lon1)
+  if not len(ss_streets["street_id"]) or not len(mh_streets["street_id"]):
+    return
+
+  # Each myhome street is matched with a single vectorized pass over the
+  # ss columns instead of a Python loop.
+  ss_lat = np.radians(ss_streets["latitude"])
+  ss_lon = np.radians(ss_streets["longitude"])
+  ss_has_city = ss_streets["has_city"]
+  ss_city = ss_streets["city_id"]
+  ss_district = ss_streets["district_name"]
+  ss_has_district = ss_district != ""
+
+  # Only look at ss streets near each myhome street: a single batched
+  # haversine radius query on a BallTree when available, else the grid.
+  # Grid cells over-cover the radius, so only that path needs prefiltering.
+  use_tree = BallTree is not None
+  if use_tree:
+    tree = BallTree(np.column_stack([ss_lat, ss_lon]), metric="haversine")
+    mh_points = np.radians(
+      np.column_stack([mh_streets["latitude"], mh_streets["longitude"]])
+    )
+    neighbours = tree.query_radius(
+      mh_points, r=max_distance_m * APPROX_MARGIN / EARTH_RADIUS_M
+    )
+  else:
+    neighbours = grid_neighbours(mh_streets, ss_streets, max_distance_m)
+
+    # Half-size of a box, in int32 microdegrees, that holds every point within
+    # max_distance_m of a myhome street. East-west it is sized per street at
+    # the box edge nearest to a pole, and spans every longitude once the box
+    # reaches the pole.
+    ss_lat_u = to_microdegrees(ss_streets["latitude"])
+    ss_lon_u = to_microdegrees(ss_streets["longitude"])
+    mh_lats_u = to_microdegrees(mh_streets["latitude"]).tolist()
+    mh_lons_u = to_microdegrees(mh_streets["longitude"]).tolist()
+    deg_m = math.radians(1.0) * EARTH_RADIUS_M
+    box_deg = max_distance_m * APPROX_MARGIN / deg_m
+    box_lat_u = math.ceil(box_deg * MICRODEGREES) + 1
+    edge_lat = np.abs(mh_streets["latitude"]) + box_deg
+    below_pole = edge_lat < 90.0
+    box_lon_deg = np.full(len(edge_lat), 360.0)
+    box_lon_deg[below_pole] = box_deg / np.cos(np.radians(edge_lat[below_pole]))
+    box_lons_u = (
+      np.ceil(np.minimum(box_lon_deg, 360.0) * MICRODEGREES).astype(np.int64) + 1
+    ).tolist()
+
+  mh_lats = mh_streets["latitude"].tolist()
+  mh_lons = mh_streets["longitude"].tolist()
+  mh_has_city = mh_streets["has_city"].tolist()
+  mh_cities = mh_streets["city_id"].tolist()
+  mh_districts = mh_streets["district_name"].tolist()
+
+  for i, (mh_lat, mh_lon, nearby) in enumerate(zip(mh_lats, mh_lons, neighbours)):
+    if not len(nearby):
+      continue
+    # Keep ss order so ties resolve the same way as a full scan
+    cand = np.sort(np.asarray(nearby, dtype=np.int64))
+
+    # Restrict to same city (both files should already be Tbilisi-only, but keep as safety)
+    mask = np.ones(len(cand), dtype=bool)
+    if mh_has_city[i]:
+      mask &= ~ss_has_city[cand] | (ss_city[cand] == mh_cities[i])
+
+    # Additional safety: if both have district names and they differ, skip
+    if mh_districts[i]:
+      mask &= ~ss_has_district[cand] | (ss_district[cand] == mh_districts[i])
+
+    if not use_tree:
+      # Integer bounding-box check before any float math
+      mask &= np.abs(ss_lat_u[cand] - mh_lats_u[i]) <= box_lat_u
+      mask &= np.abs(ss_lon_u[cand] - mh_lons_u[i]) <= box_lons_u[i]
+    cand = cand[mask]
+    if not len(cand):
+      continue
+
+    phi1 = math.radians(mh_lat)
+    lam1 = math.radians(mh_lon)
+    if not use_tree:
+      # Cheap flat-earth distance next; only the streets that can still be in
+      # range are re-ranked with the full haversine formula.
+      approx = equirectangular_distance_m(phi1, lam1, ss_lat[cand], ss_lon[cand])
+      cand = cand[approx <= max_distance_m * APPROX_MARGIN]
+      if not len(cand):
+        continue
 
-  a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(
-    dlambda / 2
-  ) ** 2
-  c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-  return R * c
+    yield i, cand, haversine_distance_m(phi1, lam1, ss_lat[cand], ss_lon[cand])
+
+
+def assign_greedy(pairs: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+  """
+  One-to-one assignment taking the closest remaining (myhome, ss) pair first.
+  """
+  used_mh: set[int] = set()
+  used_ss: set[int] = set()
+  assigned: List[Tuple[int, int, float]] = []
+  for i, j, d in sorted(pairs, key=lambda p: (p[2], p[0], p[1])):
+    if i in used_mh or j in used_ss:
+      continue
+    used_mh.add(i)
+    used_ss.add(j)
+    assigned.append((i, j, d))
+  assigned.sort()
+  return assigned
+
+
+def assign_one_to_one(
+  pairs: List[Tuple[int, int, float]], max_distance_m: float
+) -> List[Tuple[int, int, float]]:
+  """
+  Pick at most one ss street per myhome street and vice versa so that the
+  total distance is minimal, counting an unmatched myhome street as
+  max_distance_m. Falls back to assign_greedy when SciPy is not installed.
+  """
+  if not pairs:
+    return []
+  if min_weight_full_bipartite_matching is None:
+    return assign_greedy(pairs)
+
+  rows = sorted({i for i, _, _ in pairs})
+  cols = sorted({j for _, j, _ in pairs})
+  row_pos = {i: k for k, i in enumerate(rows)}
+  col_pos = {j: k for k, j in enumerate(cols)}
+  n_rows = len(rows)
+  n_cols = len(cols)
+
+  # Every myhome street also gets a private "unmatched" column, so a full
+  # matching always exists. Weights must be non-zero, hence the +1m shift
+  # (it is the same for every row and does not change the optimum).
+  r = [row_pos[i] for i, _, _ in pairs] + list(range(n_rows))
+  c = [col_pos[j] for _, j, _ in pairs] + [n_cols + k for k in range(n_rows)]
+  w = [d + 1.0 for _, _, d in pairs] + [max_distance_m + 1.0] * n_rows
+  graph = coo_matrix((w, (r, c)), shape=(n_rows, n_cols + n_rows)).tocsr()
+
+  row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+  dist = {(i, j): d for i, j, d in pairs}
+  assigned: List[Tuple[int, int, float]] = []
+  for rk, ck in zip(row_ind.tolist(), col_ind.tolist()):
+    if ck < n_cols:
+      i, j = rows[rk], cols[ck]
+      assigned.append((i, j, dist[(i, j)]))
+  return assigned
 
 
 def match_by_coords(
-  mh_streets: List[Street],
-  ss_streets: List[Street],
+  mh_streets: Streets,
+  ss_streets: Streets,
   max_distance_m: float = 100.0,
+  one_to_one: bool = False,
 ) -> List[Dict[str, Any]]:
   """
   For each myhome street, find the closest ss street within max_distance_m.
   Only accept matches when distance is <= max_distance_m.
+
+  With one_to_one=True each ss street is used at most once and the pairs
+  are chosen to minimise the total distance (see assign_one_to_one).
   """
-  matches: List[Dict[str, Any]] = []
+  pairs: List[Tuple[int, int, float]] = []
+  for i, cand, d in candidate_pairs(mh_streets, ss_streets, max_distance_m):
+    if one_to_one:
+      keep = d <= max_distance_m
+      pairs.extend((i, j, dj) for j, dj in zip(cand[keep].tolist(), d[keep].tolist()))
+      continue
 
-  for mh in mh_streets:
-    best_ss: Optional[Street] = None
-    best_dist = float("inf")
+    idx = int(d.argmin())
+    best_dist = float(d[idx])
+    if best_dist <= max_distance_m:
+      pairs.append((i, int(cand[idx]), best_dist))
 
-    for ss in ss_streets:
-      # Restrict to same city (both files should already be Tbilisi-only, but keep as safety)
-      if mh.city_id is not None and ss.city_id is not None and mh.city_id != ss.city_id:
-        continue
+  if one_to_one:
+    pairs = assign_one_to_one(pairs, max_distance_m)
 
-      # Additional safety: if both have district names and they differ, skip
-      if mh.district_name and ss.district_name and mh.district_name != ss.district_name:
-        continue
+  # Plain Python values for building the output rows
+  mh_rows = {name: col.tolist() for name, col in mh_streets.items()}
+  ss_rows = {name: col.tolist() for name, col in ss_streets.items()}
 
-      d = haversine_distance_m(mh.latitude, mh.longitude, ss.latitude, ss.longitude)
-      if d < best_dist:
-        best_dist = d
-        best_ss = ss
-
-    if best_ss and best_dist <= max_distance_m:
-      matches.append(
-        {
-          "distance_m": round(best_dist, 2),
-          "myhome": {
-            "street_id": mh.street_id,
-            "street_title": mh.street_title,
-            "district_name": mh.district_name,
-            "urban_name": mh.urban_name,
-            "latitude": mh.latitude,
-            "longitude": mh.longitude,
-          },
-          "ss": {
-            "streetId": best_ss.street_id,
-            "streetTitle": best_ss.street_title,
-            "districtTitle": best_ss.district_name,
-            "subDistrictTitle": best_ss.urban_name,
-            "latitude": best_ss.latitude,
-            "longitude": best_ss.longitude,
-          },
-        }
-      )
+  matches: List[Dict[str, Any]] = []
+  for i, j, dist in pairs:
+    matches.append(
+      {
+        "distance_m": round(dist, 2),
+        "myhome": {
+          "street_id": mh_rows["street_id"][i],
+          "street_title": mh_rows["street_title"][i],
+          "district_name": mh_rows["district_name"][i],
+          "urban_name": mh_rows["urban_name"][i],
+          "latitude": mh_rows["latitude"][i],
+          "longitude": mh_rows["longitude"][i],
+        },
+        "ss": {
+          "streetId": ss_rows["street_id"][j],
+          "streetTitle": ss_rows["street_title"][j],
+          "districtTitle": ss_rows["district_name"][j],
+          "subDistrictTitle": ss_rows["urban_name"][j],
+          "latitude": ss_rows["latitude"][j],
+          "longitude": ss_rows["longitude"][j],
+        },
+      }
+    )
 
   return matches
 
@@ -175,24 +455,29 @@ def main():
   mh_streets = load_myhome_streets()
   ss_streets = load_ss_streets()
 
-  print(f"Myhome streets with coords: {len(mh_streets)}")
-  print(f"SS streets with coords: {len(ss_streets)}")
+  print(f"Myhome streets with coords: {len(mh_streets['street_id'])}")
+  print(f"SS streets with coords: {len(ss_streets['street_id'])}")
 
   # Use a relatively small radius (100m) but much larger than 30m so that
   # coordinates for the same street (which can differ slightly between systems)
   # still match.
   max_distance_m = 100.0
-  matches = match_by_coords(mh_streets, ss_streets, max_distance_m=max_distance_m)
-  print(f"Coordinate-based matches within {max_distance_m}m: {len(matches)}")
+  # Set to True to use every ss street at most once, picking the pairs with
+  # the smallest total distance, instead of each myhome street's nearest one
+  # (which lets several myhome streets map to the same ss street).
+  one_to_one = False
+  matches = match_by_coords(
+    mh_streets, ss_streets, max_distance_m=max_distance_m, one_to_one=one_to_one
+  )
+  mode = "one-to-one" if one_to_one else "nearest"
+  print(f"Coordinate-based {mode} matches within {max_distance_m}m: {len(matches)}")
 
   # Save JSON
-  OUT_JSON.write_text(
-    json.dumps(matches, ensure_ascii=False, indent=2), encoding="utf-8"
-  )
+  OUT_JSON.write_bytes(orjson.dumps(matches, option=orjson.OPT_INDENT_2))
   print(f"Saved JSON mapping to {OUT_JSON}")
 
   # Save CSV summary
-  with OUT_CSV.open("w", encoding="utf-8", newline="") as f:
+  with OUT_CSV.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
     fieldnames = [
       "distance_m",
       "myhome_street_id",